@@ -1000,7 +1000,7 @@ class Scaffold:
         """
         Return the total amount of cells and entities placed.
         """
-        return sum(list(self.statistics.cells_placed.values()))
+        return sum(self.statistics.cells_placed.values())
 
     def for_blender(self):
         """
@@ -37,6 +37,7 @@ _t(
             ),
             ParallelIntegrityError=_e("rank"),
         ),
+        PlacementError=_e(),
         ConnectivityError=_e(),
         MorphologyError=_e(
             MorphologyRepositoryError=_e(),
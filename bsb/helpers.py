@@ -1,6 +1,7 @@
 import abc, numpy as np, os, sys, collections
 from contextlib import contextmanager
 from inspect import isclass
+from itertools import chain
 import inspect, site
 from .exceptions import *
 
@@ -663,37 +664,13 @@ def continuity_list(iterable, step=1):
     :param step: ``iterable[i]`` needs to be equal to ``iterable[i - 1] + step`` for
       them to considered continuous.
     """
-    serial = []
-    iterator = iter(iterable)
-    # Get the first item in the iterator to set the initial conditions.
-    try:
-        item = next(iterator)
-    # Iterable is empty.
-    except StopIteration:
-        # Return empty serialization.
+    items = _as_array(iterable)
+    if not len(items):
         return []
-    # Initial condition.
-    start = item
-    last_item = item
-    counter = 1
-    # Iterate over the remaining items.
-    for item in iterator:
-        # Is this new item discontinuous with the last?
-        if item != last_item + step:
-            # End the chain at the previous item and start a new one.
-            # Store the start and length of the last chain in the serialized list.
-            serial.append(start)
-            serial.append(counter)
-            # Set the values for a new list
-            counter = 1
-            start = item
-        else:
-            counter += 1
-        last_item = item
-    # Finish the last chain
-    serial.append(start)
-    serial.append(counter)
-    return serial
+    # Find where each chain starts and how long it is in one vectorized sweep.
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(items) != step) + 1))
+    counts = np.diff(np.append(starts, len(items)))
+    return list(chain.from_iterable(zip(items[starts].tolist(), counts.tolist())))
 
 
 def continuity_hop(iterator):
@@ -712,13 +689,22 @@ def expand_continuity_list(iterable, step=1):
     Return the full set of items associated with the continuity list, as formatted by
     :func:`.helpers.continuity_list`.
     """
-    deserialized = []
-    for start, count in continuity_hop(iter(iterable)):
-        # Each hop, expand a `count` long list starting from `start`
-        # taking `step` sized steps, and append it to the deserialized list.
-        end = start + count * step
-        deserialized.extend(list(range(start, end, step)))
-    return deserialized
+    return expand_continuity_array(iterable, step=step).tolist()
+
+
+def expand_continuity_array(iterable, step=1):
+    """
+    Return the full set of items associated with the continuity list as an array. See
+    :func:`.helpers.expand_continuity_list`.
+    """
+    serial = _as_array(iterable)
+    if not len(serial):
+        return np.empty(0, dtype=int)
+    starts = serial[0::2]
+    counts = serial[1::2].astype(int)
+    # Offset of each item within its chain: its global index minus the chain's start.
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(starts, counts) + offsets * step
 
 
 def iterate_continuity_list(iterable, step=1):
@@ -732,8 +718,10 @@ def iterate_continuity_list(iterable, step=1):
 
 
 def count_continuity_list(iterable):
-    total = 0
-    for _, count in continuity_hop(iter(iterable)):
-        # Each hop, add the count to the total
-        total += count
-    return total
+    return int(np.sum(_as_array(iterable)[1::2]))
+
+
+def _as_array(iterable):
+    if isinstance(iterable, np.ndarray):
+        return iterable
+    return np.array(list(iterable))
@@ -6,7 +6,7 @@ from .helpers import (
     origin,
     SortableByAfter,
     continuity_list,
-    expand_continuity_list,
+    expand_continuity_array,
     count_continuity_list,
     iterate_continuity_list,
 )
@@ -478,9 +478,8 @@ class PlacementSet(Resource):
         """
         Return a list of cell identifiers.
         """
-        return np.array(
-            expand_continuity_list(self.identifier_set.get_dataset()), dtype=int
-        )
+        ids = expand_continuity_array(self.identifier_set.get_dataset())
+        return ids.astype(int, copy=False)
 
     @property
     def positions(self):
@@ -529,7 +528,7 @@ class PlacementSet(Resource):
         return zip(*iterators)
 
     def __len__(self):
-        return count_continuity_list(self.identifier_set)
+        return count_continuity_list(self.identifier_set.get_dataset())
 
     def _none(self):
         """
@@ -1,5 +1,5 @@
 from . import __version__
-from .reporting import warn
+from .reporting import report, warn
 from .helpers import ConfigurableClass, get_qualified_class_name
 from .morphologies import Morphology, Compartment, Branch
 from bsb.helpers import suppress_stdout
@@ -364,7 +364,7 @@ class MorphologyRepository(HDF5TreeHandler):
                 and issubclass(c, arborize.NeuronModel)
                 and c != arborize.NeuronModel
             ):
-                print("Importing", n)
+                report("Importing", n, level=3)
                 self.import_arbz(n, c, overwrite=True)
 
     def save_morphology(self, name, morphology, overwrite=False):
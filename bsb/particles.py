@@ -2,7 +2,8 @@ import numpy as np
 from sklearn.neighbors import KDTree
 from rtree import index
 from random import choice
-from .reporting import report
+from .reporting import report, warn
+from .exceptions import PlacementError, PlacementWarning
 
 try:
     import plotly.graph_objects as go
@@ -223,7 +224,7 @@ class ParticleSystem:
             # print()
             if i > 100:
                 stuck = True
-                print("STUCK")
+                warn("Neighbourhood solver stuck", PlacementWarning)
                 break
         if not stuck:
             self.colliding_count -= len(neighbourhood.partners)
@@ -255,8 +256,9 @@ class ParticleSystem:
                 neighbourhood_packing_factor < 0.5 and partner_packing_factor < 0.5
             )
             if expansions > 100:
-                print("ERROR! Unable to find suited neighbourhood around", epicenter)
-                exit()
+                raise PlacementError(
+                    f"Unable to find suited neighbourhood around {epicenter}"
+                )
         # print("Neighbourhood of {} particles with radius {} and packing factor of {}. Found after {} expansions.".format(
         #     len(neighbour_ids), neighbourhood_radius, partner_packing_factor, expansions
         # ))
@@ -514,8 +516,9 @@ class AdaptiveNeighbourhood(ParticleSystem):
             )
             neighbourhood_ok = neighbourhood_packing_factor < 0.5
             if expansions > 100:
-                print("ERROR! Unable to find suited neighbourhood around", epicenter)
-                exit()
+                raise PlacementError(
+                    f"Unable to find suited neighbourhood around {epicenter}"
+                )
         # print("Neighbourhood of {} particles with radius {} and packing factor of {}. Found after {} expansions.".format(
         #     len(neighbour_ids), neighbourhood_radius, partner_packing_factor, expansions
         # ))
@@ -554,8 +557,9 @@ class SmallestNeighbourhood(ParticleSystem):
                 neighbourhood_packing_factor < 0.5 and partner_packing_factor < 0.5
             )
             if expansions > 100:
-                print("ERROR! Unable to find suited neighbourhood around", epicenter)
-                exit()
+                raise PlacementError(
+                    f"Unable to find suited neighbourhood around {epicenter}"
+                )
         # print("Neighbourhood of {} particles with radius {} and packing factor of {}. Found after {} expansions.".format(
         #     len(neighbour_ids), neighbourhood_radius, partner_packing_factor, expansions
         # ))
@@ -0,0 +1,120 @@
+"""
+Numeric kernels used by the targetting mechanisms. If Numba is installed the kernels
+are JIT compiled loops, otherwise equivalent NumPy implementations are used. The
+multithreaded Numba kernels are opt-in, see :func:`use_parallel_kernels`.
+"""
+
+import numpy as np
+
+try:
+    import numba
+
+    _has_numba = True
+except ImportError:
+    _has_numba = False
+
+
+def _in_cylinder_numpy(pos, cx, cz, r2, out):
+    """
+    Mark which positions lie within the vertical (Y axis) cylinder centered on ``(cx,
+    cz)`` with squared radius ``r2``.
+    """
+    dx = np.subtract(pos[:, 0], cx)
+    dz = np.subtract(pos[:, 2], cz)
+    np.multiply(dx, dx, out=dx)
+    np.multiply(dz, dz, out=dz)
+    np.less(np.add(dx, dz, out=dx), r2, out=out)
+
+
+def _in_sphere_numpy(pos, ox, oy, oz, r2, out):
+    """
+    Mark which positions lie within the sphere centered on ``(ox, oy, oz)`` with
+    squared radius ``r2``.
+    """
+    d = pos - np.array([ox, oy, oz])
+    np.less(np.einsum("ij,ij->i", d, d), r2, out=out)
+
+
+if _has_numba:
+
+    def _in_cylinder_loop(pos, cx, cz, r2, out):
+        for i in numba.prange(pos.shape[0]):
+            dx = pos[i, 0] - cx
+            dz = pos[i, 2] - cz
+            out[i] = dx * dx + dz * dz < r2
+
+    def _in_sphere_loop(pos, ox, oy, oz, r2, out):
+        for i in numba.prange(pos.shape[0]):
+            dx = pos[i, 0] - ox
+            dy = pos[i, 1] - oy
+            dz = pos[i, 2] - oz
+            out[i] = dx * dx + dy * dy + dz * dz < r2
+
+    _in_cylinder_numba = numba.njit(fastmath=True, cache=True)(_in_cylinder_loop)
+    _in_sphere_numba = numba.njit(fastmath=True, cache=True)(_in_sphere_loop)
+    # The multithreaded kernels are only compiled when `use_parallel_kernels` is called.
+    _in_cylinder_parallel = numba.njit(parallel=True, fastmath=True)(_in_cylinder_loop)
+    _in_sphere_parallel = numba.njit(parallel=True, fastmath=True)(_in_sphere_loop)
+    _in_cylinder = _in_cylinder_numba
+    _in_sphere = _in_sphere_numba
+else:
+    _in_cylinder = _in_cylinder_numpy
+    _in_sphere = _in_sphere_numpy
+
+
+def use_parallel_kernels(parallel=True):
+    """
+    Switch the Numba kernels between their single and multithreaded versions. Has no
+    effect if Numba is not installed.
+
+    Under MPI, the threads are divided over the processes that share a node, so that
+    the processes don't each start a thread for every core. This is a collective call
+    that must be made on all MPI processes.
+    """
+    global _in_cylinder, _in_sphere
+    if not _has_numba:
+        return
+    if not parallel:
+        _in_cylinder = _in_cylinder_numba
+        _in_sphere = _in_sphere_numba
+        return
+    try:
+        from mpi4py import MPI
+
+        node_comm = MPI.COMM_WORLD.Split_type(MPI.COMM_TYPE_SHARED)
+        local_size = node_comm.size
+        node_comm.Free()
+    except ImportError:
+        local_size = 1
+    numba.set_num_threads(max(1, numba.config.NUMBA_NUM_THREADS // local_size))
+    _in_cylinder = _in_cylinder_parallel
+    _in_sphere = _in_sphere_parallel
+
+
+def in_cylinder(positions, center, radius):
+    """
+    Return a boolean mask of the positions that lie within the vertical cylinder.
+
+    :param positions: (N, 3) array of positions.
+    :param center: The X and Z coordinates of the cylinder axis.
+    :param radius: The radius of the cylinder.
+    """
+    positions = np.ascontiguousarray(positions, dtype=np.float64)
+    out = np.empty(len(positions), dtype=bool)
+    _in_cylinder(positions, float(center[0]), float(center[1]), float(radius) ** 2, out)
+    return out
+
+
+def in_sphere(positions, origin, radius):
+    """
+    Return a boolean mask of the positions that lie within the sphere.
+
+    :param positions: (N, 3) array of positions.
+    :param origin: The center of the sphere.
+    :param radius: The radius of the sphere.
+    """
+    positions = np.ascontiguousarray(positions, dtype=np.float64)
+    out = np.empty(len(positions), dtype=bool)
+    ox, oy, oz = (float(c) for c in origin)
+    _in_sphere(positions, ox, oy, oz, float(radius) ** 2, out)
+    return out
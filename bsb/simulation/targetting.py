@@ -1,107 +1,124 @@
-import random, numpy as np
+import numpy as np
 from ..exceptions import *
+from ._kernels import in_cylinder, in_sphere
 from itertools import chain
 
 
+def _sample_indices(total, n):
+    """
+    Sample ``n`` distinct indices out of ``range(total)``, using O(n) memory.
+    """
+    if n > total // 2:
+        # Most indices are picked anyway, a permutation is as cheap as it gets.
+        return np.random.permutation(total)[:n]
+    # Draw with replacement and top up the duplicates until there are enough.
+    idx = np.unique(np.random.randint(total, size=n))
+    while len(idx) < n:
+        extra = np.random.randint(total, size=n - len(idx))
+        idx = np.unique(np.concatenate((idx, extra)))
+    return idx
+
+
 class TargetsNeurons:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Rebuild the registry so that it picks up the targetting methods that the
+        # subclass adds or overrides.
+        cls._TARGETTING_METHODS = {
+            k[9:]: getattr(cls, k) for k in dir(cls) if k.startswith("_targets_")
+        }
+        cls.neuron_targetting_types = list(cls._TARGETTING_METHODS.keys())
+
     def initialise(self, scaffold):
         super().initialise(scaffold)
         # Set targetting method
-        get_targets_name = "_targets_" + self.targetting
-        method = (
-            getattr(self, get_targets_name) if hasattr(self, get_targets_name) else None
-        )
-        if not callable(method):
+        method = self._TARGETTING_METHODS.get(self.targetting)
+        if method is None:
             raise NotImplementedError(
                 "Unimplemented neuron targetting type '{}' in {}".format(
                     self.targetting, self.node_name
                 )
             )
-        self._get_targets = method
+        self._get_targets = method.__get__(self)
 
     def _targets_local(self):
         """
-        Target all or certain cells in a spherical location.
+        Target all or certain cells in a spherical location. Multiple spheres can be
+        targetted at once by giving a list of origins.
         """
+        origins = np.array(self.origin, dtype=float).reshape(-1, 3)
         if len(self.cell_types) != 1:
-            # Compile a list of the cells and build a compound tree.
-            target_cells = np.empty((0, 5))
-            id_map = np.empty((0, 1))
-            for t in self.cell_types:
-                cells = self.scaffold.get_cells_by_type(t)
-                target_cells = np.vstack((target_cells, cells[:, 2:5]))
-                id_map = np.vstack((id_map, cells[:, 0]))
-            tree = KDTree(target_cells)
-            target_positions = target_cells
-        else:
-            # Retrieve the prebuilt tree from the SHDF file
-            tree = self.scaffold.trees.cells.get_tree(self.cell_types[0])
-            target_cells = self.scaffold.get_cells_by_type(self.cell_types[0])
-            id_map = target_cells[:, 0]
-            target_positions = target_cells[:, 2:5]
-        # Query the tree for all the targets
-        target_ids = tree.query_radius(np.array(self.origin).reshape(1, -1), self.radius)[
-            0
-        ].tolist()
+            # Compile a list of the cells and filter them directly, building a compound
+            # tree for a single query would cost more than it saves.
+            target_positions, id_map = self._concatenate_cell_positions()
+            return id_map[self._in_any_sphere(target_positions, origins)]
+        # Retrieve the prebuilt tree from the SHDF file
+        tree = self.scaffold.trees.cells.get_tree(self.cell_types[0])
+        target_cells = self.scaffold.get_cells_by_type(self.cell_types[0])
+        id_map = target_cells[:, 0]
+        if tree is None:
+            # No prebuilt tree is available, filter the positions directly.
+            return id_map[self._in_any_sphere(target_cells[:, 2:5], origins)]
+        # Query the tree for the targets of all origins at once
+        target_ids = np.unique(np.concatenate(tree.query_radius(origins, self.radius)))
         return id_map[target_ids]
 
+    def _in_any_sphere(self, positions, origins):
+        mask = np.zeros(len(positions), dtype=bool)
+        for origin in origins:
+            mask |= in_sphere(positions, origin, self.radius)
+        return mask
+
     def _targets_cylinder(self):
         """
         Target all or certain cells within a cylinder of specified radius.
         """
         if len(self.cell_types) != 1:
             # Compile a list of the cells.
-            target_cells = np.empty((0, 5))
-            id_map = np.empty((0, 1))
-            for t in self.cell_types:
-                cells = self.scaffold.get_cells_by_type(t)
-                target_cells = np.vstack((target_cells, cells[:, 2:5]))
-                id_map = np.vstack((id_map, cells[:, 0]))
-            target_positions = target_cells
+            target_positions, id_map = self._concatenate_cell_positions()
         else:
-            # Retrieve the prebuilt tree from the SHDF file
-            # tree = self.scaffold.trees.cells.get_tree(self.cell_types[0])
             target_cells = self.scaffold.get_cells_by_type(self.cell_types[0])
-            # id_map = target_cells[:, 0]
+            id_map = target_cells[:, 0]
             target_positions = target_cells[:, 2:5]
-            # Query the tree for all the targets
-            center_scaffold = [
-                self.scaffold.configuration.X / 2,
-                self.scaffold.configuration.Z / 2,
-            ]
-
-            # Find cells falling into the cylinder volume
-            target_cells_idx = np.sum(
-                (target_positions[:, [0, 2]] - np.array(center_scaffold)) ** 2, axis=1
-            ).__lt__(self.radius ** 2)
-            cylinder_target_cells = target_cells[target_cells_idx, 0]
-            cylinder_target_cells = cylinder_target_cells.astype(int)
-            cylinder_target_cells = cylinder_target_cells.tolist()
-            # print(id_stim)
-            return cylinder_target_cells
+        center_scaffold = [
+            self.scaffold.configuration.X / 2,
+            self.scaffold.configuration.Z / 2,
+        ]
+        # Find cells falling into the cylinder volume
+        target_cells_idx = in_cylinder(target_positions, center_scaffold, self.radius)
+        cylinder_target_cells = id_map[target_cells_idx]
+        cylinder_target_cells = cylinder_target_cells.astype(int)
+        cylinder_target_cells = cylinder_target_cells.tolist()
+        return cylinder_target_cells
+
+    def _concatenate_cell_positions(self):
+        """
+        Collect the positions and ids of all the targetted cell types into 2 arrays,
+        allocating each array only once.
+        """
+        pos_list = []
+        id_list = []
+        for t in self.cell_types:
+            cells = self.scaffold.get_cells_by_type(t).astype(np.float64, copy=False)
+            pos_list.append(cells[:, 2:5])
+            id_list.append(cells[:, 0])
+        if not pos_list:
+            return np.empty((0, 3)), np.empty(0)
+        return np.concatenate(pos_list), np.concatenate(id_list)
 
     def _targets_cell_type(self):
         """
         Target all cells of certain cell types
         """
         cell_types = [self.scaffold.get_cell_type(t) for t in self.cell_types]
-        if len(cell_types) != 1:
-            # Concatenate a list of the different cell type cells.
-            target_cells = np.array([])
-            for t in cell_types:
-                if t.entity:
-                    ids = self.scaffold.get_entities_by_type(t.name)
-                else:
-                    ids = self.scaffold.get_cells_by_type(t.name)[:, 0]
-                target_cells = np.concatenate((target_cells, ids))
-            ids = target_cells
-        else:
-            # Retrieve a single list
-            t = cell_types[0]
-            if t.entity:
-                ids = self.scaffold.get_entities_by_type(t.name)
-            else:
-                ids = self.scaffold.get_cells_by_type(t.name)[:, 0]
+        # Concatenate the ids of all the targetted cell types in one go.
+        arrays = [
+            self.scaffold.get_entities_by_type(t.name)
+            if t.entity
+            else self.scaffold.get_cells_by_type(t.name)[:, 0]
+            for t in cell_types
+        ]
+        ids = np.concatenate(arrays) if arrays else np.empty(0)
         n = len(ids)
         # Use the `cell_fraction` or `cell_count` attribute to determine what portion of
         # the selected ids to exclude.
@@ -109,12 +126,14 @@ class TargetsNeurons:
             r_threshold = getattr(
                 self, "cell_fraction", getattr(self, "cell_count", n) / n
             )
-            if r_threshold == 1:
+            k = int(round(r_threshold * n))
+            if k >= n:
                 return ids
-            elif r_threshold == 0:
+            elif k <= 0:
                 return np.empty(0)
             else:
-                return ids[np.random.random_sample(n) <= r_threshold]
+                # Sort the picks to preserve the order of the ids.
+                return ids[np.sort(_sample_indices(n, k))]
         else:
             return np.empty(0)
 
@@ -128,7 +147,9 @@ class TargetsNeurons:
             target_types = list(filter(lambda c: c.name in self.cell_types, target_types))
         target_ids = [cell_type.get_ids() for cell_type in target_types]
         representatives = [
-            random.choice(type_ids) for type_ids in target_ids if len(target_ids) > 0
+            int(type_ids[np.random.randint(len(type_ids))])
+            for type_ids in target_ids
+            if len(type_ids) > 0
         ]
         return representatives
 
@@ -149,8 +170,8 @@ class TargetsNeurons:
                 n = count
             else:
                 n = total
-            n = max(0, min(n, total))
-            targets.extend(random.sample(list(labelled), n))
+            n = int(max(0, min(n, total)))
+            targets.extend(labelled[i] for i in _sample_indices(total, n))
         return targets
 
     def get_targets(self):
@@ -178,12 +199,17 @@ class TargetsNeurons:
         )
 
     def initialise_targets(self):
+        MPI = self.scaffold.MPI
+        comm = MPI.COMM_WORLD
         if self.adapter.pc_id == 0:
-            targets = self._get_targets()
+            targets = np.ascontiguousarray(self._get_targets(), dtype=np.int64)
+            comm.bcast(len(targets), root=0)
         else:
-            targets = None
+            targets = np.empty(comm.bcast(None, root=0), dtype=np.int64)
         # Broadcast to make sure all the nodes have the same targets for each device.
-        self._targets = self.scaffold.MPI.COMM_WORLD.bcast(targets, root=0)
+        # The targets are ids, so they can be sent as a raw buffer instead of pickled.
+        comm.Bcast([targets, MPI.INT64_T], root=0)
+        self._targets = targets
 
     def initialise_patterns(self):
         if self.adapter.pc_id == 0:
@@ -195,7 +221,10 @@ class TargetsNeurons:
         self._patterns = self.scaffold.MPI.COMM_WORLD.bcast(patterns, root=0)
 
     # Define new targetting methods above this line or they will not be registered.
-    neuron_targetting_types = [s[9:] for s in vars().keys() if s.startswith("_targets_")]
+    _TARGETTING_METHODS = {
+        k[9:]: v for k, v in vars().items() if k.startswith("_targets_")
+    }
+    neuron_targetting_types = list(_TARGETTING_METHODS.keys())
 
 
 class TargetsSections:
@@ -213,9 +242,24 @@ class TargetsSections:
         if not hasattr(self, "section_count"):
             self.section_count = 1
         if hasattr(self, "section_type"):
-            sections = [s for s in cell.sections if self.section_type in s.labels]
+            sections = self._get_labelled_sections(cell, self.section_type)
         else:
             sections = cell.soma
         if self.section_count == "all":
+            return list(sections)
+        picks = np.random.randint(len(sections), size=self.section_count)
+        return [sections[i] for i in picks]
+
+    def _get_labelled_sections(self, cell, label):
+        # Cache the sections per label on the cell, as many devices may target the same
+        # type of section on the same cell. Tuples keep callers from altering the cache.
+        try:
+            cache = cell._bsb_section_cache
+        except AttributeError:
+            cache = cell._bsb_section_cache = {}
+        try:
+            return cache[label]
+        except KeyError:
+            sections = tuple(s for s in cell.sections if label in s.labels)
+            cache[label] = sections
             return sections
-        return [random.choice(sections) for _ in range(self.section_count)]
@@ -228,7 +228,7 @@ class NestDevice(TargetsNeurons, SimulationComponent):
 
     casts = {
         "radius": float,
-        "origin": [float],
+        "origin": ([float], [[float]]),
         "parameters": dict,
         "stimulus": ListEvalConfiguration.cast,
     }
@@ -330,7 +330,7 @@ class NestAdapter(SimulatorAdapter):
         self.suffix = ""
         self.multi = False
         self.has_lock = False
-        self.global_identifier_map = {}
+        self.reset_identifier_map()
         self.simulation_id = _randint()
 
     def prepare(self):
@@ -449,7 +449,7 @@ class NestAdapter(SimulatorAdapter):
         self.is_prepared = False
         if hasattr(self, "nest"):
             self.reset_kernel()
-        self.global_identifier_map = {}
+        self.reset_identifier_map()
         for cell_model in self.cell_models.values():
             cell_model.reset()
         if self.has_lock:
@@ -522,7 +522,7 @@ class NestAdapter(SimulatorAdapter):
 
             rank = mpi4py.MPI.COMM_WORLD.rank
         except Exception as e:
-            print(str(e))
+            report(str(e), level=4)
             rank = 0
 
         timestamp = str(time.time()).split(".")[0] + str(_randint())
@@ -616,6 +616,12 @@ class NestAdapter(SimulatorAdapter):
                 else:
                     raise
 
+    def reset_identifier_map(self):
+        self.global_identifier_map = {}
+        self._sorted_nest_ids = np.empty(0, dtype=np.int64)
+        self._sorted_scaffold_ids = np.empty(0, dtype=np.int64)
+        self._nest_id_table = np.empty(0, dtype=np.int64)
+
     def _build_identifier_map(self):
         # Iterate over all simulation components that contain representations
         # of scaffold components with an ID to create a map of all scaffold ID's
@@ -625,13 +631,44 @@ class NestAdapter(SimulatorAdapter):
             mapping_type._build_identifier_map()
             # Add the type's map to the global map
             self.global_identifier_map.update(mapping_type.scaffold_to_nest_map)
+        # Store the NEST ids sorted, alongside their scaffold ids, so that NEST ids can
+        # be mapped back to scaffold ids with a vectorized binary search.
+        nest_ids = np.fromiter(
+            self.global_identifier_map.values(),
+            dtype=np.int64,
+            count=len(self.global_identifier_map),
+        )
+        scaffold_ids = np.fromiter(
+            self.global_identifier_map.keys(),
+            dtype=np.int64,
+            count=len(self.global_identifier_map),
+        )
+        order = np.argsort(nest_ids)
+        self._sorted_nest_ids = nest_ids[order]
+        self._sorted_scaffold_ids = scaffold_ids[order]
+        # Scaffold ids are dense, so they can directly index a table of NEST ids, where
+        # -1 marks scaffold ids that aren't represented in NEST.
+        size = scaffold_ids.max() + 1 if len(scaffold_ids) else 0
+        self._nest_id_table = np.full(size, -1, dtype=np.int64)
+        self._nest_id_table[scaffold_ids] = nest_ids
 
     def get_nest_ids(self, ids):
-        return [self.global_identifier_map[id] for id in ids]
+        ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+        known = (ids >= 0) & (ids < len(self._nest_id_table))
+        known[known] = self._nest_id_table[ids[known]] != -1
+        if not np.all(known):
+            raise KeyError(int(ids[~known][0]))
+        return self._nest_id_table[ids].tolist()
 
     def get_scaffold_ids(self, ids):
-        scaffold_map = {v: k for k, v in self.global_identifier_map.items()}
-        return [scaffold_map[id] for id in ids]
+        ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+        idx = np.searchsorted(self._sorted_nest_ids, ids)
+        # Check that the ids were found, and not just their insertion point.
+        known = idx < len(self._sorted_nest_ids)
+        known[known] = self._sorted_nest_ids[idx[known]] == ids[known]
+        if not np.all(known):
+            raise KeyError(int(ids[~known][0]))
+        return self._sorted_scaffold_ids[idx].tolist()
 
     def create_neurons(self):
         """
@@ -954,17 +991,22 @@ class SpikeRecorder(SimulationRecorder):
         files = glob("*" + self.device_model.parameters["label"] + "*.gdf")
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
-            spikes = np.zeros((0, 2), dtype=float)
+            file_spikes = []
             for file in files:
-                file_spikes = np.loadtxt(file)
-                if len(file_spikes):
-                    scaffold_ids = np.array(
-                        self.device_model.adapter.get_scaffold_ids(file_spikes[:, 0])
-                    )
-                    times = file_spikes[:, 1]
-                    scaffold_spikes = np.vstack((scaffold_ids, times)).T
-                    spikes = np.vstack((spikes, scaffold_spikes))
+                data = np.loadtxt(file, ndmin=2)
+                if len(data):
+                    file_spikes.append(data)
                 os.remove(file)
+        # Fill a single preallocated array instead of stacking onto it per file.
+        spikes = np.empty((sum(len(data) for data in file_spikes), 2), dtype=float)
+        ptr = 0
+        for data in file_spikes:
+            n = len(data)
+            spikes[ptr : ptr + n, 0] = self.device_model.adapter.get_scaffold_ids(
+                data[:, 0]
+            )
+            spikes[ptr : ptr + n, 1] = data[:, 1]
+            ptr += n
         return spikes
 
     def get_meta(self):
@@ -95,7 +95,7 @@ class NeuronDevice(TargetsNeurons, TargetsSections, SimulationComponent):
 
     casts = {
         "radius": float,
-        "origin": [float],
+        "origin": ([float], [[float]]),
     }
 
     defaults = {}
@@ -189,6 +189,38 @@ class NeuronEntity:
         raise NotImplementedError("Entities do not have a soma to record.")
 
 
+class RoundRobinCells:
+    """
+    Membership test for the cells assigned to a node by round robin, without storing
+    the ids of those cells.
+    """
+
+    def __init__(self, node, nodes, total):
+        self.node = node
+        self.nodes = nodes
+        self.total = total
+
+    def __contains__(self, id):
+        return (
+            0 <= id < self.total and int(id) == id and int(id) % self.nodes == self.node
+        )
+
+    def __len__(self):
+        return len(range(self.node, self.total, self.nodes))
+
+    def mask(self, ids):
+        """
+        Return a boolean mask of which of the given ``ids`` belong to this node.
+        """
+        ids = np.asarray(ids)
+        return (
+            (ids >= 0)
+            & (ids < self.total)
+            & (ids % 1 == 0)
+            & (ids % self.nodes == self.node)
+        )
+
+
 class NeuronAdapter(SimulatorAdapter):
     """
     Interface between the scaffold model and the NEURON simulator.
@@ -346,7 +378,7 @@ class NeuronAdapter(SimulatorAdapter):
         self.pc_id = pc.id()
         self.cell_total = self.scaffold.get_cell_total()
         # Do a lazy round robin for now.
-        self.node_cells = set(range(pc.id(), self.scaffold.get_cell_total(), pc.nhost()))
+        self.node_cells = RoundRobinCells(self.pc_id, self.nhost, self.cell_total)
 
     def simulate(self, simulator):
         from plotly import graph_objects as go
@@ -523,10 +555,9 @@ class NeuronAdapter(SimulatorAdapter):
             else:
                 cell_data = self.scaffold.get_cells_by_type(cell_model.name)
             report("Placing " + str(len(cell_data)) + " " + cell_model.name)
-            for cell in cell_data:
+            node_cell_data = cell_data[self.node_cells.mask(cell_data[:, 0])]
+            for cell in node_cell_data:
                 cell_id = int(cell[0])
-                if not cell_id in self.node_cells:
-                    continue
                 kwargs = cell_model.get_parameters()
                 kwargs["position"] = cell[2:5]
                 if cell_model.entity or cell_model.relay:
@@ -563,13 +594,13 @@ class NeuronAdapter(SimulatorAdapter):
 
     def create_devices(self):
         for device in self.devices.values():
-            if self.pc_id == 0:
-                # Have root 0 prepare the possibly random targets.
-                targets = device.get_targets()
-            else:
-                targets = None
-            # Broadcast to make sure all the nodes have the same targets for each device.
-            targets = self.scaffold.MPI.COMM_WORLD.bcast(targets, root=0)
+            # The targets were already broadcast by `initialise_targets`, so each node
+            # only has to implement the targets that are relays or cells on this node.
+            targets = (
+                t
+                for t in device.get_targets()
+                if t in self.relay_scheme or t in self.node_cells
+            )
             for target in targets:
                 for location in device.get_locations(target):
                     device.implement(target, location)
@@ -753,4 +784,8 @@ class TargetLocation:
 class SpikeRecorder(LocationRecorder):
     def get_data(self):
         recording = np.array(self.recorder)
-        return np.vstack((np.ones(recording.shape) * self.id, recording))
+        # Write the ids and spike times into one preallocated array.
+        data = np.empty((2, len(recording)))
+        data[0] = self.id
+        data[1] = recording
+        return data
@@ -53,5 +53,6 @@ setuptools.setup(
         "dev": ["sphinx", "furo", "pre-commit", "black==20.8b1"],
         "neuron": ["NEURON>=7.8.1.1", "dbbs_models>=1.5.0rc0", "nrn-patch>=3.0.0b3"],
         "mpi": ["mpi4py"],
+        "numba": ["numba"],
     },
 )
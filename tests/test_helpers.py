@@ -0,0 +1,43 @@
+import unittest, os, sys, numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bsb.helpers import (
+    continuity_list,
+    expand_continuity_list,
+    expand_continuity_array,
+    count_continuity_list,
+    iterate_continuity_list,
+)
+
+
+class TestContinuityList(unittest.TestCase):
+    def test_compact(self):
+        self.assertEqual([4, 6, 12, 1], continuity_list([4, 5, 6, 7, 8, 9, 12]))
+        self.assertEqual([], continuity_list([]))
+        self.assertEqual([3, 1], continuity_list([3]))
+        self.assertEqual([0, 3, 7, 2], continuity_list([0, 2, 4, 7, 9], step=2))
+
+    def test_input_types(self):
+        items = [4, 5, 6, 7, 8, 9, 12]
+        self.assertEqual([4, 6, 12, 1], continuity_list(np.array(items)))
+        self.assertEqual([4, 6, 12, 1], continuity_list(i for i in items))
+        self.assertEqual(items, expand_continuity_list(np.array([4, 6, 12, 1])))
+        self.assertEqual(7, count_continuity_list(i for i in [4, 6, 12, 1]))
+
+    def test_round_trip(self):
+        for items, step in (
+            ([4, 5, 6, 7, 8, 9, 12], 1),
+            ([0, 2, 4, 7, 9], 2),
+            ([10, 9, 8, 20], 1),
+            ([1, 3, 4, 5, 100, 101], 1),
+            (np.unique(np.random.randint(1000, size=200)).tolist(), 1),
+            ([], 1),
+        ):
+            with self.subTest(items=items, step=step):
+                serial = continuity_list(items, step=step)
+                self.assertEqual(items, expand_continuity_list(serial, step=step))
+                array = expand_continuity_array(np.array(serial), step=step)
+                self.assertIsInstance(array, np.ndarray)
+                self.assertEqual(items, array.tolist())
+                self.assertEqual(items, list(iterate_continuity_list(serial, step=step)))
+                self.assertEqual(len(items), count_continuity_list(serial))
@@ -3,7 +3,7 @@ import unittest, os, sys, numpy as np, h5py, importlib
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from bsb.core import Scaffold
 from bsb.config import JSONConfig
-from bsb.simulators.nest import NestCell
+from bsb.simulators.nest import NestCell, NestAdapter, MapsScaffoldIdentifiers
 from bsb.models import Layer, CellType
 from bsb.exceptions import *
 
@@ -464,3 +464,80 @@ class TestDeviceProtocol(unittest.TestCase):
         self.assertEqual(1, len(adapter.result.recorders))
         adapter.simulate(simulator)
         adapter.collect_output()
+
+
+class MockedIdentifiers(MapsScaffoldIdentifiers):
+    def __init__(self, scaffold_identifiers, nest_identifiers):
+        self.reset_identifiers()
+        self.scaffold_identifiers.extend(scaffold_identifiers)
+        self.nest_identifiers.extend(nest_identifiers)
+
+    def reset(self):
+        self.reset_identifiers()
+
+
+class TestIdentifierMap(unittest.TestCase):
+    def setUp(self):
+        self.adapter = NestAdapter()
+        self.adapter.cell_models = {
+            "a": MockedIdentifiers([5, 3, 9], [1, 2, 3]),
+            "b": MockedIdentifiers([0, 7], [4, 5]),
+        }
+        self.adapter.entities = {"e": MockedIdentifiers([12, 11], [10, 11])}
+        self.adapter._build_identifier_map()
+
+    def test_scaffold_ids(self):
+        self.assertEqual(
+            [5, 3, 9, 0, 7, 12, 11],
+            self.adapter.get_scaffold_ids(np.array([1.0, 2, 3, 4, 5, 10, 11])),
+        )
+        self.assertEqual([], self.adapter.get_scaffold_ids([]))
+
+    def test_unknown_nest_ids(self):
+        # Unknown ids in between, before and after the known NEST ids.
+        for id in (6, 0, 12):
+            with self.subTest(id=id):
+                with self.assertRaises(KeyError) as cm:
+                    self.adapter.get_scaffold_ids([1, id])
+                self.assertEqual(id, cm.exception.args[0])
+
+    def _reset(self):
+        # Reset the adapter without a NEST kernel to reset.
+        self.adapter._nest = None
+        self.adapter.reset_kernel = lambda: None
+        self.adapter.reset()
+
+    def test_scaffold_ids_reset(self):
+        """
+        Test that NEST ids are unknown before the map is built and after a reset.
+        """
+        with self.assertRaises(KeyError):
+            NestAdapter().get_scaffold_ids([1])
+        self._reset()
+        with self.assertRaises(KeyError):
+            self.adapter.get_scaffold_ids([1])
+
+    def test_nest_ids(self):
+        self.assertEqual(
+            [1, 2, 3, 4, 5, 10, 11],
+            self.adapter.get_nest_ids(np.array([5, 3, 9, 0, 7, 12, 11])),
+        )
+        self.assertEqual([], self.adapter.get_nest_ids([]))
+
+    def test_nest_ids_reset(self):
+        """
+        Test that scaffold ids are unknown before the map is built and after a reset.
+        """
+        with self.assertRaises(KeyError):
+            NestAdapter().get_nest_ids([5])
+        self._reset()
+        with self.assertRaises(KeyError):
+            self.adapter.get_nest_ids([5])
+
+    def test_unknown_scaffold_ids(self):
+        # Unknown ids in between the known scaffold ids, negative and out of range.
+        for id in (1, -1, 13):
+            with self.subTest(id=id):
+                with self.assertRaises(KeyError) as cm:
+                    self.adapter.get_nest_ids([5, id])
+                self.assertEqual(id, cm.exception.args[0])
@@ -4,6 +4,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from bsb.core import Scaffold, from_hdf5
 from bsb.config import JSONConfig
 from bsb.simulators.nest import NestCell
+from bsb.simulators.neuron.adapter import RoundRobinCells
 from bsb.models import Layer, CellType
 from bsb.exceptions import *
 
@@ -476,3 +477,25 @@ class NeuronTest(unittest.TestCase):
                     ),
                 ]
             ).show()
+
+
+class TestRoundRobinCells(unittest.TestCase):
+    def setUp(self):
+        # Node 1 out of 3 nodes, with 10 cells in total.
+        self.node_cells = RoundRobinCells(1, 3, 10)
+
+    def test_membership(self):
+        self.assertEqual([1, 4, 7], [i for i in range(-3, 14) if i in self.node_cells])
+        self.assertEqual(3, len(self.node_cells))
+        self.assertIn(4.0, self.node_cells)
+        self.assertIn(np.int64(7), self.node_cells)
+        self.assertNotIn(4.5, self.node_cells)
+        self.assertNotIn(10, self.node_cells)
+
+    def test_mask(self):
+        ids = np.arange(-3, 14)
+        self.assertEqual([1, 4, 7], ids[self.node_cells.mask(ids)].tolist())
+        float_ids = np.array([1.0, 1.5, 4.0, 7.0, 10.0])
+        self.assertEqual(
+            [True, False, True, True, False], self.node_cells.mask(float_ids).tolist()
+        )
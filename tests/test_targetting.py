@@ -5,6 +5,11 @@ from bsb.config import JSONConfig
 from bsb.core import Scaffold
 import bsb.helpers
 from bsb.exceptions import *
+from bsb.helpers import cast_node
+from bsb.simulators.neuron.adapter import NeuronDevice
+from sklearn.neighbors import KDTree
+from bsb.simulation.targetting import TargetsNeurons, TargetsSections
+from bsb.simulation import _kernels
 
 
 def relative_to_tests_folder(path):
@@ -20,6 +25,10 @@ def neuron_installed():
     return importlib.util.find_spec("neuron")
 
 
+def numba_installed():
+    return importlib.util.find_spec("numba")
+
+
 @unittest.skipIf(not neuron_installed(), "NEURON is not importable.")
 class TestTargetting(unittest.TestCase):
     def test_representatives(self):
@@ -42,3 +51,292 @@ class TestTargetting(unittest.TestCase):
             len(targets),
             "Targetting type `representatives` did not return the correct amount of representatives.",
         )
+
+
+class MockedTreeCollection:
+    def __init__(self):
+        self.trees = {}
+
+    def get_tree(self, name):
+        return self.trees.get(name)
+
+
+class MockedScaffold:
+    """
+    Minimal scaffold that serves the cells of each cell type from a dictionary.
+    """
+
+    def __init__(self, cells, X=100.0, Z=100.0):
+        self.cells_by_type = {k: np.array(v, dtype=float) for k, v in cells.items()}
+        self.configuration = type("MockedConfiguration", (), {"X": X, "Z": Z})()
+        self.labels = {}
+        self.trees = type("MockedTrees", (), {"cells": MockedTreeCollection()})()
+
+    def get_cells_by_type(self, name):
+        return self.cells_by_type[name]
+
+    def get_cell_type(self, name):
+        return type("MockedCellType", (), {"name": name, "entity": False})()
+
+    def get_labels(self, pattern):
+        return [pattern] if pattern in self.labels else []
+
+
+class MockedComponent:
+    node_name = "simulations.mocked.devices"
+
+    def initialise(self, scaffold):
+        self.scaffold = scaffold
+
+
+class MockedDevice(TargetsNeurons, MockedComponent):
+    def __init__(self, scaffold, **kwargs):
+        self.scaffold = scaffold
+        self.__dict__.update(kwargs)
+
+
+class TestTargettingMechanisms(unittest.TestCase):
+    def test_cylinder_multiple_types(self):
+        """
+        Test that the cylinder targetting filters and returns the cells of all types.
+        """
+        # Cells are rows of id, type, x, y, z. The cylinder is centered on X/2, Z/2.
+        scaffold = MockedScaffold(
+            {
+                "a": [[0, 0, 50, 0, 50], [1, 0, 0, 0, 0]],
+                "b": [[2, 1, 55, 20, 52], [3, 1, 90, 0, 90]],
+            }
+        )
+        device = MockedDevice(scaffold, cell_types=["a", "b"], radius=10)
+        self.assertEqual([0, 2], device._targets_cylinder())
+
+    def test_subclass_targetting_methods(self):
+        """
+        Test that subclasses can add and override targetting methods.
+        """
+
+        class CustomDevice(MockedDevice):
+            def _targets_by_id(self):
+                return ["overridden"]
+
+            def _targets_custom(self):
+                return ["custom"]
+
+        self.assertIn("custom", CustomDevice.neuron_targetting_types)
+        self.assertNotIn("custom", TargetsNeurons.neuron_targetting_types)
+        for targetting, expected in (("by_id", "overridden"), ("custom", "custom")):
+            with self.subTest(targetting=targetting):
+                device = CustomDevice(None, targetting=targetting, targets=[1])
+                device.initialise(None)
+                self.assertEqual([expected], device._get_targets())
+        device = MockedDevice(None, targetting="by_id", targets=[1])
+        device.initialise(None)
+        self.assertEqual([1], device._get_targets())
+        with self.assertRaises(NotImplementedError):
+            MockedDevice(None, targetting="custom").initialise(None)
+
+    def test_representatives_empty_type(self):
+        """
+        Test that cell types without cells are skipped when picking representatives.
+        """
+
+        class MockedCellType:
+            def __init__(self, name, ids, relay=False):
+                self.name = name
+                self.relay = relay
+                self._ids = np.array(ids, dtype=int)
+
+            def get_ids(self):
+                return self._ids
+
+        cell_types = [
+            MockedCellType("a", [4, 5]),
+            MockedCellType("empty", []),
+            MockedCellType("relay", [6], relay=True),
+        ]
+        models = {t.name: type("MockedModel", (), {"cell_type": t}) for t in cell_types}
+        adapter = type("MockedAdapter", (), {"cell_models": models})
+        device = MockedDevice(None, adapter=adapter)
+        targets = device._targets_representatives()
+        self.assertEqual(1, len(targets))
+        self.assertIn(targets[0], [4, 5])
+
+    def test_cell_type(self):
+        """
+        Test that the `cell_type` targetting selects exactly `round(fraction * n)` or
+        `cell_count` distinct cells, in order.
+        """
+        cells = [[i, 0, 0, 0, 0] for i in range(100, 140)]
+        scaffold = MockedScaffold({"a": cells[:30], "b": cells[30:]})
+        for kwargs, expected in (
+            ({}, 40),
+            ({"cell_count": 7}, 7),
+            ({"cell_count": 50}, 40),
+            ({"cell_fraction": 0.5}, 20),
+            ({"cell_fraction": 0.26}, 10),
+            ({"cell_fraction": 0.01}, 0),
+        ):
+            with self.subTest(**kwargs):
+                device = MockedDevice(scaffold, cell_types=["a", "b"], **kwargs)
+                targets = device._targets_cell_type().tolist()
+                self.assertEqual(expected, len(set(targets)))
+                self.assertEqual(sorted(targets), targets)
+                self.assertTrue(set(targets) <= set(range(100, 140)))
+
+    def test_by_label(self):
+        """
+        Test that the `by_label` targetting samples the requested amount of distinct
+        labelled cells.
+        """
+        scaffold = MockedScaffold({})
+        scaffold.labels["label"] = list(range(100, 200))
+        for kwargs, expected in (
+            ({}, 100),
+            ({"cell_count": 10}, 10),
+            ({"cell_fraction": 0.75}, 75),
+            ({"cell_fraction": 0.051}, 6),
+        ):
+            with self.subTest(**kwargs):
+                device = MockedDevice(scaffold, labels=["label"], **kwargs)
+                targets = device._targets_by_label()
+                self.assertEqual(expected, len(set(targets)))
+                self.assertTrue(set(targets) <= set(scaffold.labels["label"]))
+
+    def test_section_cache(self):
+        """
+        Test that altering the targetted sections doesn't alter the cached sections.
+        """
+        MockedSection = type("MockedSection", (), {})
+        sections = [MockedSection() for _ in range(3)]
+        for section, labels in zip(sections, (["dendrites"], ["axon"], ["dendrites"])):
+            section.labels = labels
+        cell = type("MockedCell", (), {"sections": sections})()
+        device = type("MockedSectionDevice", (TargetsSections,), {})()
+        device.section_type = "dendrites"
+        device.section_count = "all"
+        targetted = device.target_section(cell)
+        self.assertEqual([sections[0], sections[2]], targetted)
+        targetted.clear()
+        self.assertEqual([sections[0], sections[2]], device.target_section(cell))
+        device.section_count = 5
+        picks = device.target_section(cell)
+        self.assertEqual(5, len(picks))
+        self.assertTrue(all(s in (sections[0], sections[2]) for s in picks))
+
+    def _local_scaffold(self, tree):
+        # Cells are rows of id, type, x, y, z.
+        cells = [
+            [0, 0, 0, 0, 0],
+            [1, 0, 1, 0, 0],
+            [2, 0, 5, 5, 5],
+            [3, 0, 10, 10, 10],
+            [4, 0, 10, 11, 10],
+        ]
+        scaffold = MockedScaffold({"a": cells, "b": [[5, 1, 0, 0, 1]]})
+        if tree:
+            positions = scaffold.get_cells_by_type("a")[:, 2:5]
+            scaffold.trees.cells.trees["a"] = KDTree(positions)
+        return scaffold
+
+    def test_local(self):
+        """
+        Test the `local` targetting with one or several origins, with or without a
+        prebuilt tree, and for one or several cell types.
+        """
+        single = [0.0, 0.0, 0.0]
+        multiple = [[0.0, 0.0, 0.0], [10.0, 10.0, 10.0]]
+        cases = (
+            (True, ["a"], single, [0, 1]),
+            (True, ["a"], multiple, [0, 1, 3, 4]),
+            (False, ["a"], single, [0, 1]),
+            (False, ["a"], multiple, [0, 1, 3, 4]),
+            (False, ["a", "b"], single, [0, 1, 5]),
+            (False, ["a", "b"], multiple, [0, 1, 3, 4, 5]),
+        )
+        for tree, cell_types, origin, expected in cases:
+            with self.subTest(tree=tree, cell_types=cell_types, origin=origin):
+                device = MockedDevice(
+                    self._local_scaffold(tree),
+                    cell_types=cell_types,
+                    origin=origin,
+                    radius=1.5,
+                )
+                self.assertEqual(expected, sorted(device._targets_local().astype(int)))
+
+    def test_initialise_targets(self):
+        """
+        Test that the targets are broadcast as int64 arrays, whether the targetting
+        returns float ids or a list.
+        """
+        from mpi4py import MPI
+
+        scaffold = self._local_scaffold(tree=True)
+        scaffold.MPI = MPI
+        scaffold.labels["label"] = [7, 8, 9]
+        adapter = type("MockedAdapter", (), {"pc_id": 0})
+        for kwargs, expected in (
+            ({"targetting": "local", "origin": [0, 0, 0], "radius": 1.5}, [0, 1]),
+            ({"targetting": "by_label", "labels": ["label"]}, [7, 8, 9]),
+            ({"targetting": "by_id", "targets": []}, []),
+        ):
+            with self.subTest(targetting=kwargs["targetting"]):
+                device = MockedDevice(None, cell_types=["a"], adapter=adapter, **kwargs)
+                device.initialise(scaffold)
+                device.initialise_targets()
+                targets = device.get_targets()
+                self.assertIsInstance(targets, np.ndarray)
+                self.assertEqual(np.int64, targets.dtype)
+                self.assertEqual(expected, sorted(targets.tolist()))
+
+    def test_origin_cast(self):
+        """
+        Test that device origins can be configured as a point or a list of points.
+        """
+        cast = NeuronDevice.casts["origin"]
+        self.assertEqual([1.0, 2.0, 3.0], cast_node([1, 2, 3], cast, "origin", "test"))
+        self.assertEqual(
+            [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]],
+            cast_node([[1, 2, 3], [4, 5, 6]], cast, "origin", "test"),
+        )
+
+
+class TestKernels(unittest.TestCase):
+    def setUp(self):
+        self.positions = np.random.default_rng(0).uniform(-10, 10, size=(1000, 3))
+        p = self.positions
+        self.cylinder = (p[:, 0] - 1) ** 2 + (p[:, 2] - 2) ** 2 < 25
+        self.sphere = np.sum((p - [1, 2, 3]) ** 2, axis=1) < 25
+
+    def _assert_kernels(self, in_cylinder, in_sphere):
+        out = np.empty(len(self.positions), dtype=bool)
+        in_cylinder(self.positions, 1.0, 2.0, 25.0, out)
+        self.assertEqual(self.cylinder.tolist(), out.tolist())
+        in_sphere(self.positions, 1.0, 2.0, 3.0, 25.0, out)
+        self.assertEqual(self.sphere.tolist(), out.tolist())
+
+    def test_numpy(self):
+        self._assert_kernels(_kernels._in_cylinder_numpy, _kernels._in_sphere_numpy)
+
+    @unittest.skipIf(not numba_installed(), "Numba is not importable.")
+    def test_numba(self):
+        self._assert_kernels(_kernels._in_cylinder_numba, _kernels._in_sphere_numba)
+        self._assert_kernels(
+            _kernels._in_cylinder_parallel, _kernels._in_sphere_parallel
+        )
+
+    @unittest.skipIf(not numba_installed(), "Numba is not importable.")
+    def test_use_parallel_kernels(self):
+        try:
+            _kernels.use_parallel_kernels()
+            self.assertIs(_kernels._in_sphere_parallel, _kernels._in_sphere)
+            mask = _kernels.in_sphere(self.positions, [1, 2, 3], 5)
+            self.assertEqual(self.sphere.tolist(), mask.tolist())
+        finally:
+            _kernels.use_parallel_kernels(False)
+        self.assertIs(_kernels._in_sphere_numba, _kernels._in_sphere)
+
+    def test_public_kernels(self):
+        mask = _kernels.in_cylinder(self.positions, [1, 2], 5)
+        self.assertEqual(self.cylinder.tolist(), mask.tolist())
+        mask = _kernels.in_sphere(self.positions, [1, 2, 3], 5)
+        self.assertEqual(self.sphere.tolist(), mask.tolist())